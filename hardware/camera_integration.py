@@ -6,12 +6,19 @@ Designed for integration with automated printer systems
 """
 
 import cv2
+import math
+import numpy as np
+import queue
+import shutil
 import subprocess
 import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Tuple, Optional, List
+from typing import Callable, Dict, Tuple, Optional, List
+
+from hardware import v4l2_controls
 
 # Camera Configuration
 VIDEO_DEVICES = {
@@ -33,43 +40,87 @@ VIDEO_DEVICES = {
     }
 }
 
+# Derived lookups, computed once instead of per capture
+for _config in VIDEO_DEVICES.values():
+    _config['device_num'] = int(_config['node'].split('video')[-1])
+    _config['sensor_flip'] = False  # Set once the sensor handles 'rotate' itself
+NODE_TO_DEVICE_ID = {config['node']: device_id for device_id, config in VIDEO_DEVICES.items()}
+
+# Capture settings
+CAPTURE_FOURCC = cv2.VideoWriter_fourcc(*'MJPG')
+CAPTURE_JPEG_QUALITY = 95
+CAPTURE_POOL_SIZE = 1  # Full-resolution frame buffers kept for reuse per resolution
+# A pooled 8000x6000 buffer holds ~144 MB; the pool is released when a timelapse ends and in cleanup_all()
+CAPTURE_WARMUP_FRAMES = 5  # Frames grabbed (not decoded) while exposure settles
+CAPTURE_MODE_SWITCH_FRAMES = 2  # Frames skipped after switching a streaming camera to the capture mode, like fswebcam --skip 2
+CAPTURE_WARM_WINDOW = 60.0  # Seconds after a successful capture during which a reopened camera skips only CAPTURE_MODE_SWITCH_FRAMES
+MAX_PENDING_WRITES = 4  # Encoded images queued or being written before capture waits for the disk
+MAX_PENDING_FRAMES = 1  # Decoded full-resolution frames (144 MB at 8000x6000) waiting to be encoded
+CAPTURE_TMP_DIR = '/dev/shm'  # tmpfs where fswebcam writes before the file is moved to its destination
+
 # Preview settings
-PREVIEW_FOURCC = cv2.VideoWriter_fourcc(*'YUYV')
+PREVIEW_FOURCC = cv2.VideoWriter_fourcc(*'MJPG')
+PREVIEW_FALLBACK_FOURCC = cv2.VideoWriter_fourcc(*'YUYV')
 PREVIEW_FPS = 20
+PREVIEW_POOL_SIZE = 2  # Frames handed back by consumers, kept for the next decodes
+PREVIEW_BUFFERS = 3  # Driver buffers; the grab() loop keeps the newest, spares let the camera keep filling during a decode
+STATUS_PRINT_INTERVAL = 5.0  # Minimum seconds between repeated per-frame status lines
 FOCUS_MIN, FOCUS_MAX = 1, 127
 
+# Cameras already run on their own threads; give OpenCV's internal pool a share of the cores each
+OPENCV_THREADS = max(1, (os.cpu_count() or 1) // len(VIDEO_DEVICES))
+
 # Global state for camera system
 _camera_streams = {}
 _timelapse_workers = {}
+_image_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cam-writer')
+_pending_writes = threading.BoundedSemaphore(MAX_PENDING_WRITES)
+_pending_frames = threading.BoundedSemaphore(MAX_PENDING_FRAMES)
+_camera_pool = ThreadPoolExecutor(max_workers=len(VIDEO_DEVICES), thread_name_prefix='cam-capture')
+_frame_pool = {}
+_dependencies_ok = None
+_last_capture_ts = {}
+
+# Resolve the external tools once; later calls exec the absolute path
+_FSWEBCAM = shutil.which("fswebcam")
+_V4L2_CTL = shutil.which("v4l2-ctl")
 
 def check_dependencies() -> bool:
-    """Check if required camera tools are available"""
+    """Check if required camera tools are available (checked once per session)"""
+    global _dependencies_ok
+    if _dependencies_ok is not None:
+        return _dependencies_ok
+    
     dependencies_ok = True
     
-    try:
-        subprocess.run(["fswebcam", "--version"], capture_output=True, text=True, check=True)
+    # Paths were looked up on PATH at import rather than by forking the tools
+    if _FSWEBCAM:
         print("[+] fswebcam found")
-    except FileNotFoundError:
+    else:
         print("[!] fswebcam not found. Install: sudo apt install fswebcam")
         dependencies_ok = False
     
-    try:
-        subprocess.run(["v4l2-ctl", "--version"], capture_output=True, check=True)
+    if _V4L2_CTL:
         print("[+] v4l2-ctl found")
-    except:
+    else:
         print("[!] v4l2-ctl not found. Install: sudo apt install v4l-utils")
         dependencies_ok = False
     
+    _dependencies_ok = dependencies_ok
     return dependencies_ok
 
 def get_available_cameras() -> List[str]:
     """Get list of available camera device IDs"""
     available = []
     for device_id, config in VIDEO_DEVICES.items():
-        if os.path.exists(config['node']) and os.access(config['node'], os.R_OK | os.W_OK):
+        node = config['node']
+        # access() also fails for a missing node, so the extra stat is only paid on failure
+        if os.access(node, os.R_OK | os.W_OK):
             available.append(device_id)
+        elif not os.path.exists(node):
+            print(f"[!] Cannot access {node}: device not found")
         else:
-            print(f"[!] Cannot access {config['node']}")
+            print(f"[!] Cannot access {node}: permission denied")
     return available
 
 def set_camera_focus(device_node: str, focus_value: Optional[int] = None) -> bool:
@@ -85,25 +136,61 @@ def set_camera_focus(device_node: str, focus_value: Optional[int] = None) -> boo
     """
     try:
         if focus_value is not None:
-            # Manual focus
-            subprocess.run([
-                "v4l2-ctl", "-d", device_node,
-                "--set-ctrl=focus_automatic_continuous=0",
-                f"--set-ctrl=focus_absolute={focus_value}"
-            ], check=False)
+            # Manual focus; ioctl first, v4l2-ctl if the driver rejects it
+            if not (v4l2_controls.set_control(device_node, 'focus_automatic_continuous', 0) and
+                    v4l2_controls.set_control(device_node, 'focus_absolute', focus_value)):
+                if not _V4L2_CTL:
+                    print(f"[!] Failed to set focus for {device_node}: ioctl rejected and v4l2-ctl not installed")
+                    return False
+                subprocess.run([
+                    _V4L2_CTL, "-d", device_node,
+                    "--set-ctrl=focus_automatic_continuous=0",
+                    f"--set-ctrl=focus_absolute={focus_value}"
+                ], check=False)
             print(f"[*] {device_node}: Manual focus set to {focus_value}")
         else:
             # Auto focus
-            subprocess.run([
-                "v4l2-ctl", "-d", device_node,
-                "--set-ctrl=focus_automatic_continuous=1"
-            ], check=False)
+            if not v4l2_controls.set_control(device_node, 'focus_automatic_continuous', 1):
+                if not _V4L2_CTL:
+                    print(f"[!] Failed to enable auto focus for {device_node}: ioctl rejected and v4l2-ctl not installed")
+                    return False
+                subprocess.run([
+                    _V4L2_CTL, "-d", device_node,
+                    "--set-ctrl=focus_automatic_continuous=1"
+                ], check=False)
             print(f"[*] {device_node}: Auto focus enabled")
         return True
     except Exception as e:
         print(f"[!] Failed to set focus for {device_node}: {e}")
         return False
 
+def set_camera_orientation(device_id: str) -> bool:
+    """
+    Apply a configured 180 degree rotation on the sensor with HFLIP/VFLIP
+    
+    Args:
+        device_id: Camera device ID
+        
+    Returns:
+        bool: True if the sensor now rotates frames, so no software flip is needed
+    """
+    config = VIDEO_DEVICES[device_id]
+    device_node = config['node']
+    if not config['rotate']:
+        return False
+    
+    sensor_flip = (v4l2_controls.set_control(device_node, 'horizontal_flip', 1) and
+                   v4l2_controls.set_control(device_node, 'vertical_flip', 1))
+    if sensor_flip:
+        print(f"[*] {device_node}: Rotation handled by sensor flip")
+    else:
+        # Don't leave a half-applied mirror behind
+        v4l2_controls.set_control(device_node, 'horizontal_flip', 0)
+        print(f"[*] {device_node}: Sensor flip not supported, rotating in software")
+    
+    config['sensor_flip'] = sensor_flip
+    return sensor_flip
+
 def initialize_cameras() -> bool:
     """
     Initialize all available cameras with their focus settings
@@ -117,10 +204,13 @@ def initialize_cameras() -> bool:
         print("[!] No cameras available for initialization")
         return False
     
-    for device_id in available_cameras:
-        config = VIDEO_DEVICES[device_id]
-        set_camera_focus(config['node'], config['focus_value'])
-        print(f"[+] Initialized camera {device_id} ({config['name']})")
+    # Process-wide setting, so apply it only once the camera system is actually brought up
+    cv2.setNumThreads(OPENCV_THREADS)
+    
+    # Each camera is configured through its own device node, so set them up concurrently
+    futures = [_camera_pool.submit(_initialize_camera, device_id) for device_id in available_cameras]
+    for future in futures:
+        future.result()
     
     return True
 
@@ -140,11 +230,14 @@ def capture_image_fswebcam(device_id: str, save_path: Optional[str] = None,
     if device_id not in VIDEO_DEVICES:
         return False, f"Unknown device ID: {device_id}"
     
+    if not _FSWEBCAM:
+        return False, "fswebcam not installed"
+    
     config = VIDEO_DEVICES[device_id]
     device_node = config['node']
     width, height = config['capture_resolution']
     camera_name = config['name']
-    rotate = config['rotate']
+    rotate = _software_rotate(config)
     
     # Generate filename if not provided
     if filename is None:
@@ -161,19 +254,25 @@ def capture_image_fswebcam(device_id: str, save_path: Optional[str] = None,
     
     print(f"[*] Capturing from {device_node} ({width}x{height})...")
     
-    # Stop preview stream if active
-    _stop_preview_stream(device_id)
+    # Let fswebcam write to RAM so it exits without waiting for the SD card
+    if os.path.isdir(CAPTURE_TMP_DIR):
+        output_path = os.path.join(CAPTURE_TMP_DIR, f"{device_id}_{os.path.basename(filepath)}")
+    else:
+        output_path = filepath
+    
+    # Pause preview stream if active
+    preview = _pause_preview_stream(device_id)
     
     try:
         cmd = [
-            "fswebcam",
+            _FSWEBCAM,
             "-d", device_node,
             "-r", f"{width}x{height}",
-            "--jpeg", "95",
+            "--jpeg", str(CAPTURE_JPEG_QUALITY),
             "--no-banner",
             "--skip", "2",
             "-v",
-            filepath
+            output_path
         ]
         
         if rotate:
@@ -182,11 +281,18 @@ def capture_image_fswebcam(device_id: str, save_path: Optional[str] = None,
         print(f"[*] Running: {' '.join(cmd)}")
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
         
-        if result.returncode == 0 and os.path.exists(filepath):
-            size_mb = os.path.getsize(filepath) / (1024*1024)
-            print(f"[+] Photo saved: {os.path.abspath(filepath)} ({size_mb:.1f} MB)")
+        if result.returncode == 0 and os.path.exists(output_path):
+            if output_path != filepath:
+                # "Photo saved" is printed once the file has reached its destination
+                _move_image_async(output_path, filepath)
+                print(f"[*] Moving {os.path.abspath(filepath)} into place in background")
+            else:
+                size_mb = os.path.getsize(filepath) / (1024*1024)
+                print(f"[+] Photo saved: {os.path.abspath(filepath)} ({size_mb:.1f} MB)")
             return True, filepath
         else:
+            if output_path != filepath:
+                _remove_quietly(output_path)
             error_msg = result.stderr if result.stderr else "Unknown error"
             print(f"[!] fswebcam failed for {device_node}: {error_msg}")
             return False, f"fswebcam error: {error_msg}"
@@ -198,13 +304,16 @@ def capture_image_fswebcam(device_id: str, save_path: Optional[str] = None,
         print(f"[!] fswebcam exception for {device_node}: {e}")
         return False, str(e)
     finally:
-        # Restart preview stream if it was active
-        _restart_preview_stream(device_id)
+        # Resume preview stream if it was active
+        _resume_preview_stream(preview)
 
 def capture_image_opencv(device_id: str, save_path: Optional[str] = None,
                         filename: Optional[str] = None) -> Tuple[bool, str]:
     """
-    Capture image using OpenCV (fallback method)
+    Capture image using OpenCV (default method)
+    
+    The frame is grabbed synchronously; encoding and writing happen on the
+    background writer pool after this function returns.
     
     Args:
         device_id: Camera device ID
@@ -212,7 +321,9 @@ def capture_image_opencv(device_id: str, save_path: Optional[str] = None,
         filename: Custom filename
         
     Returns:
-        Tuple[bool, str]: (success, filename_or_error_message)
+        Tuple[bool, str]: (success, filename_or_error_message). (True, filepath)
+        only means the frame was captured and its encode/write was queued;
+        encode or write errors are reported later by the writer pool.
     """
     if device_id not in VIDEO_DEVICES:
         return False, f"Unknown device ID: {device_id}"
@@ -221,8 +332,8 @@ def capture_image_opencv(device_id: str, save_path: Optional[str] = None,
     device_node = config['node']
     width, height = config['capture_resolution']
     camera_name = config['name']
-    rotate = config['rotate']
-    device_num = int(device_node.split('video')[-1])
+    rotate = _software_rotate(config)
+    device_num = config['device_num']
     
     # Generate filename if not provided
     if filename is None:
@@ -239,48 +350,59 @@ def capture_image_opencv(device_id: str, save_path: Optional[str] = None,
     
     print(f"[*] OpenCV capture from {device_node} ({width}x{height})...")
     
-    # Stop preview stream if active
-    _stop_preview_stream(device_id)
+    preview = _camera_streams.get(device_id)
     
     try:
-        cap = cv2.VideoCapture(device_num, cv2.CAP_V4L2)
-        if not cap.isOpened():
-            return False, f"Failed to open {device_node}"
-        
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-        
-        time.sleep(1)  # Allow camera to adjust
+        if preview is not None and preview.cap is not None:
+            # Switch the preview's open device to the capture mode and back instead of reopening it
+            ret, frame = preview.capture_still()
+        else:
+            cap = cv2.VideoCapture(device_num, cv2.CAP_V4L2)
+            if not cap.isOpened():
+                return False, f"Failed to open {device_node}"
+            
+            # A camera that was just capturing has settled; a cold one needs a few frames
+            last_active = _last_capture_ts.get(device_id)
+            warm = last_active is not None and time.monotonic() - last_active < CAPTURE_WARM_WINDOW
+            # Even a settled sensor is disturbed by the reopen, so skip at least as many as a mode switch
+            skip = CAPTURE_MODE_SWITCH_FRAMES if warm else CAPTURE_WARMUP_FRAMES
+            try:
+                ret, frame = _capture_frame(cap, device_id, skip)
+            finally:
+                cap.release()
         
-        ret, frame = cap.read()
-        cap.release()
+        if ret and frame is not None and frame.ndim == 2:
+            # Undecoded MJPG frame: write the bytes directly, skipping decode and re-encode
+            jpeg = _as_raw_jpeg(frame)
+            if jpeg is not None:
+                _write_image_async(filepath, jpeg)
+                print(f"[*] Writing {os.path.abspath(filepath)} in background")
+                return True, filepath
+            frame = cv2.imdecode(frame, cv2.IMREAD_COLOR)
         
         if ret and frame is not None:
             if rotate:
-                frame = cv2.flip(frame, -1)
+                cv2.flip(frame, -1, dst=frame)
             
-            success = cv2.imwrite(filepath, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-            if success:
-                size_mb = os.path.getsize(filepath) / (1024*1024)
-                print(f"[+] Photo saved: {os.path.abspath(filepath)} ({size_mb:.1f} MB)")
-                return True, filepath
-            else:
-                return False, "Failed to save image"
+            # Encoding a full-resolution frame takes a while; let the preview continue meanwhile
+            _save_image_async(filepath, frame)
+            print(f"[*] Encoding {os.path.abspath(filepath)} in background")
+            return True, filepath
         else:
             return False, "Failed to capture frame"
             
     except Exception as e:
         return False, str(e)
-    finally:
-        # Restart preview stream if it was active
-        _restart_preview_stream(device_id)
 
 def capture_image(device_id: str, save_path: Optional[str] = None,
-                 filename: Optional[str] = None, method: str = 'fswebcam') -> Tuple[bool, str]:
+                 filename: Optional[str] = None, method: str = 'opencv') -> Tuple[bool, str]:
     """
     Capture image with automatic fallback between methods
     
+    Falls back to the other method only when the primary one fails to
+    capture. OpenCV encode and write errors happen on the writer pool after
+    return, so they do not trigger the fswebcam fallback.
+    
     Args:
         device_id: Camera device ID
         save_path: Directory to save image
@@ -324,14 +446,29 @@ def capture_all_cameras(save_path: Optional[str] = None,
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Capture from each camera
+    # Capture from each camera in parallel; the cameras sit on separate devices
+    futures = {}
     for device_id in available_cameras:
         config = VIDEO_DEVICES[device_id]
         filename = f"{filename_prefix}_{config['name']}_{timestamp}.jpg"
-        
-        success, result = capture_image(device_id, save_path, filename)
+        futures[device_id] = _camera_pool.submit(capture_image, device_id, save_path, filename)
+    
+    failed = []
+    for device_id, future in futures.items():
+        success, result = future.result()
         results[device_id] = (success, result)
-        
+        if not success:
+            failed.append(device_id)
+    
+    if failed and len(futures) > 1:
+        # Two full-resolution streams can exceed the shared USB bandwidth; retry the failures one at a time
+        print(f"[*] Retrying {', '.join(failed)} one camera at a time...")
+        for device_id in failed:
+            config = VIDEO_DEVICES[device_id]
+            filename = f"{filename_prefix}_{config['name']}_{timestamp}.jpg"
+            results[device_id] = capture_image(device_id, save_path, filename)
+    
+    for device_id, (success, result) in results.items():
         if success:
             print(f"[+] {device_id} captured successfully")
         else:
@@ -362,6 +499,23 @@ def start_timelapse(device_id: str, interval_seconds: float, duration_seconds: f
         print(f"[!] Timelapse already running for {device_id}")
         return False
     
+    # Coerce once here so the worker loop only ever sees finite positive floats
+    try:
+        interval_seconds = float(interval_seconds)
+        duration_seconds = float(duration_seconds)
+    except (TypeError, ValueError):
+        print(f"[!] Invalid timelapse timing: interval={interval_seconds!r}, duration={duration_seconds!r}")
+        return False
+    
+    # NaN slips past "<= 0" and would capture back to back; infinity would never finish
+    if not (math.isfinite(interval_seconds) and math.isfinite(duration_seconds)):
+        print(f"[!] Invalid timelapse timing: interval={interval_seconds!r}, duration={duration_seconds!r}")
+        return False
+    
+    if interval_seconds <= 0 or duration_seconds <= 0:
+        print("[!] Timelapse interval and duration must be positive")
+        return False
+    
     # Create timelapse directory
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     config = VIDEO_DEVICES[device_id]
@@ -405,36 +559,74 @@ def is_timelapse_active(device_id: str) -> bool:
 class VideoStream:
     """Video stream for live preview"""
     
-    def __init__(self, device_config):
-        self.device_id = None
-        for did, cfg in VIDEO_DEVICES.items():
-            if cfg == device_config:
-                self.device_id = did
-                break
-        
+    def __init__(self, device_config, on_frame: Optional[Callable[[str], None]] = None):
+        self.device_id = NODE_TO_DEVICE_ID.get(device_config['node'])
+        self.on_frame = on_frame
         self.node = device_config['node']
         self.w, self.h = device_config['preview_resolution']
-        self.rotate = device_config['rotate']
-        self.device_num = int(self.node.split('video')[-1])
+        self.rotate = _software_rotate(device_config)
+        self.device_num = device_config['device_num']
         self.cap = None
-        self.frame = None
+        self.q = queue.Queue(maxsize=1)
         self.running = False
+        self.thread = None
+        self._streaming = threading.Event()
+        self._cap_lock = threading.Lock()
+        self._next_due = 0.0
+        self._buf = None
+        self._spare = None
+        self._returned = queue.Queue(maxsize=PREVIEW_POOL_SIZE)
+        self._rescale = False
+        self.visible = True
+        self._callback_errors = 0
+        self._callback_error_ts = None
+
+    def _open(self) -> bool:
+        """Open the capture device and apply preview settings"""
+        self.cap = cv2.VideoCapture(self.device_num, cv2.CAP_V4L2)
+        if not self.cap.isOpened():
+            return False
+            
+        self._apply_preview_mode()
+        return True
+
+    def _apply_preview_mode(self):
+        """Set the preview format, size and rate on the open device"""
+        self.cap.set(cv2.CAP_PROP_FOURCC, PREVIEW_FOURCC)
+        if int(self.cap.get(cv2.CAP_PROP_FOURCC)) != PREVIEW_FOURCC:
+            # Camera refused MJPG, stream raw YUYV instead
+            self.cap.set(cv2.CAP_PROP_FOURCC, PREVIEW_FALLBACK_FOURCC)
+        self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.w)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.h)
+        self.cap.set(cv2.CAP_PROP_FPS, PREVIEW_FPS)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, PREVIEW_BUFFERS)
+
+    def capture_still(self):
+        """Capture one frame at capture resolution on the open device, then return to preview"""
+        with self._cap_lock:
+            if self.cap is None or not self.cap.isOpened():
+                return False, None
+            try:
+                # The sensor was streaming, but AE/AWB re-adjusts after the switch to the capture mode
+                return _capture_frame(self.cap, self.device_id, CAPTURE_MODE_SWITCH_FRAMES)
+            finally:
+                self._apply_preview_mode()
 
     def start(self) -> bool:
         """Start the video stream"""
         try:
-            self.cap = cv2.VideoCapture(self.device_num, cv2.CAP_V4L2)
-            if not self.cap.isOpened():
+            if not self._open():
                 return False
-                
-            self.cap.set(cv2.CAP_PROP_FOURCC, PREVIEW_FOURCC)
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.w)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.h)
-            self.cap.set(cv2.CAP_PROP_FPS, PREVIEW_FPS)
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
+            self._spare = np.empty((self.h, self.w, 3), dtype=np.uint8)
+            if self.rotate:
+                self._buf = np.empty_like(self._spare)
             
             self.running = True
-            threading.Thread(target=self._reader, daemon=True).start()
+            self._streaming.set()
+            self.thread = threading.Thread(target=self._reader, name=f"cam-preview-{self.device_id}", daemon=True)
+            self.thread.start()
             
             # Register stream globally
             if self.device_id:
@@ -447,24 +639,138 @@ class VideoStream:
 
     def _reader(self):
         """Background thread to read frames"""
+        frame_interval = 1 / PREVIEW_FPS
         while self.running:
-            if self.cap and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                if ret and frame is not None:
-                    if self.rotate:
-                        frame = cv2.flip(frame, -1)
-                    self.frame = frame
-                else:
-                    time.sleep(0.01)
+            # Block while paused instead of polling; woken by resume() or stop()
+            if not self._streaming.wait(timeout=1.0):
+                continue
+            
+            ret = False
+            with self._cap_lock:
+                if self.cap and self.cap.isOpened():
+                    # grab() only advances the stream; decode just the frames we publish
+                    grabbed = self.cap.grab()
+                    now = time.monotonic()
+                    # Keep draining the driver while hidden, but skip decoding frames nobody sees.
+                    # Only thin out a camera running faster than PREVIEW_FPS: half an interval of
+                    # slack keeps on-rate frames that arrive a little early.
+                    if grabbed and (not self.visible or now < self._next_due - 0.5 * frame_interval):
+                        continue
+                    if grabbed:
+                        ret = self._retrieve()
+                        if ret:
+                            # Running deadline so jitter doesn't accumulate; restart it after a stall
+                            self._next_due = max(self._next_due + frame_interval, now)
+            
+            if not ret:
+                time.sleep(0.01)
+            elif self.on_frame:
+                try:
+                    self.on_frame(self.device_id)
+                except Exception as e:
+                    self._report_callback_error(e)
+
+    def _report_callback_error(self, error: Exception):
+        """Print on_frame failures at most once per STATUS_PRINT_INTERVAL; they can repeat every frame"""
+        self._callback_errors += 1
+        now = time.monotonic()
+        if self._callback_error_ts is not None and now - self._callback_error_ts < STATUS_PRINT_INTERVAL:
+            return
+        print(f"[!] Preview frame callback failed for {self.device_id} ({self._callback_errors}x): {error}")
+        self._callback_error_ts = now
+        self._callback_errors = 0
+
+    def _retrieve(self) -> bool:
+        """Decode the grabbed frame and publish it at preview resolution, dropping any unconsumed frame"""
+        if self._spare is None:
+            # The last frame went to a consumer; reuse one it handed back if there is one
+            try:
+                self._spare = self._returned.get_nowait()
+            except queue.Empty:
+                pass
+        
+        # Decode straight into the publish buffer unless a flip or resize pass follows;
+        # retrieve(), flip() and resize() only allocate when no reusable buffer fits
+        direct = not (self.rotate or self._rescale)
+        ret, decoded = self.cap.retrieve(self._spare if direct else self._buf)
+        if not ret or decoded is None:
+            return False
+        
+        if decoded.shape[0] != self.h or decoded.shape[1] != self.w:
+            # Driver ignored the preview size; scale here so consumers never handle full frames
+            self._rescale = True
+        
+        if direct and not self._rescale:
+            frame = decoded
+        else:
+            self._buf = decoded
+            if self._rescale:
+                frame = cv2.resize(decoded, (self.w, self.h), dst=self._spare,
+                                   interpolation=cv2.INTER_AREA)
+                if self.rotate:
+                    cv2.flip(frame, -1, dst=frame)
             else:
-                time.sleep(0.1)
+                frame = cv2.flip(decoded, -1, dst=self._spare)
+        
+        try:
+            # The previous frame was never consumed; recycle it for the next decode
+            self._spare = self.q.get_nowait()
+        except queue.Empty:
+            self._spare = None
+        self.q.put_nowait(frame)
+        return True
+
+    def release(self, frame: np.ndarray):
+        """Take back a consumed frame so a later decode can write into it instead of allocating"""
+        if frame.shape != (self.h, self.w, 3) or frame.dtype != np.uint8 or not frame.flags['C_CONTIGUOUS']:
+            return
+        try:
+            self._returned.put_nowait(frame)
+        except queue.Full:
+            pass
+
+    def set_visible(self, visible: bool):
+        """Turn frame decoding on or off, e.g. while the preview window is minimized"""
+        with self._cap_lock:
+            self.visible = visible
+            if not visible:
+                # Drop the frame in the slot so the first frame after showing is fresh
+                try:
+                    self._spare = self.q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def pause(self):
+        """Release the device so another capture can use it, keeping the reader thread alive"""
+        self._streaming.clear()
+        with self._cap_lock:
+            if self.cap:
+                self.cap.release()
+                self.cap = None
+
+    def resume(self) -> bool:
+        """Reopen the device after pause() and continue streaming"""
+        with self._cap_lock:
+            # Stopped while paused: the reader is gone, so an opened device would never be released
+            if not self.running:
+                return False
+            if not self._open():
+                print(f"[!] Failed to reopen {self.node} for preview")
+                return False
+        self._streaming.set()
+        return True
 
     def stop(self):
-        """Stop the video stream"""
+        """Stop the video stream and wait for its reader thread to exit"""
         self.running = False
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        self._streaming.set()
+        with self._cap_lock:
+            if self.cap:
+                self.cap.release()
+                self.cap = None
+        
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
         
         # Unregister stream globally
         if self.device_id and self.device_id in _camera_streams:
@@ -486,16 +792,19 @@ class TimelapseWorker:
         self.filename_prefix = filename_prefix
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()
 
     def start(self):
         """Start the timelapse worker"""
         self.running = True
-        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._worker, name=f"cam-timelapse-{self.device_id}", daemon=True)
         self.thread.start()
 
     def stop(self):
         """Stop the timelapse worker"""
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=1)
 
@@ -505,58 +814,255 @@ class TimelapseWorker:
 
     def _worker(self):
         """Main timelapse worker function"""
-        start_time = time.time()
+        # Monotonic clock: NTP corrections after boot must not shift the schedule
+        start_time = time.monotonic()
+        end_time = start_time + self.duration
+        frame_prefix = f"{self.filename_prefix}_frame_"
         frame_count = 0
+        captured = 0
+        last_status = None
         
         print(f"[+] Timelapse worker started for {self.device_id}")
         
-        while self.running and (time.time() - start_time) < self.duration:
-            # Calculate when this frame should be captured
+        while self.running and time.monotonic() < end_time:
+            # Frame k is due at start + k*interval, however long earlier captures took
             target_time = start_time + (frame_count * self.interval)
-            current_time = time.time()
+            if target_time >= end_time:
+                break
+            current_time = time.monotonic()
             
-            # Wait until it's time for next capture
+            # Wait until it's time for next capture; stop() wakes us immediately
             if current_time < target_time:
                 sleep_time = target_time - current_time
-                time.sleep(sleep_time)
+                if self._stop_event.wait(sleep_time):
+                    break
             
             # Capture frame
-            filename = f"{self.filename_prefix}_frame_{frame_count:04d}.jpg"
+            filename = f"{frame_prefix}{frame_count:04d}.jpg"
             success, result = capture_image(self.device_id, self.save_path, filename)
             
             if success:
-                frame_count += 1
-                elapsed = time.time() - start_time
-                remaining = self.duration - elapsed
-                print(f"[+] Timelapse {self.device_id}: Frame {frame_count} captured ({remaining:.0f}s remaining)")
+                captured += 1
+                now = time.monotonic()
+                # Short intervals would print every frame; keep progress to one line per few seconds
+                if last_status is None or now - last_status >= STATUS_PRINT_INTERVAL:
+                    print(f"[+] Timelapse {self.device_id}: Frame {captured} captured ({end_time - now:.0f}s remaining)")
+                    last_status = now
             else:
                 print(f"[!] Timelapse {self.device_id}: Frame {frame_count} failed - {result}")
             
+            # Advance the schedule once per slot, captured or not
             frame_count += 1
         
-        print(f"[+] Timelapse completed for {self.device_id}: {frame_count} frames captured")
+        print(f"[+] Timelapse completed for {self.device_id}: {captured} frames captured")
         self.running = False
+        _release_frame_pool()
 
 # Internal helper functions
-def _stop_preview_stream(device_id: str):
-    """Stop preview stream for device (internal use)"""
-    if device_id in _camera_streams:
-        _camera_streams[device_id].stop()
-        time.sleep(0.5)  # Allow device to be released
+def _initialize_camera(device_id: str):
+    """Apply focus and orientation settings to one camera (internal use)"""
+    config = VIDEO_DEVICES[device_id]
+    set_camera_focus(config['node'], config['focus_value'])
+    set_camera_orientation(device_id)
+    print(f"[+] Initialized camera {device_id} ({config['name']})")
 
-def _restart_preview_stream(device_id: str):
-    """Restart preview stream for device (internal use)"""
-    if device_id in VIDEO_DEVICES:
-        config = VIDEO_DEVICES[device_id]
-        stream = VideoStream(config)
-        if stream.start():
-            time.sleep(0.3)
-            print(f"[+] Preview restarted for {device_id}")
+def _capture_frame(cap: cv2.VideoCapture, device_id: str, skip_frames: int):
+    """Switch an open device to the capture mode and read one frame (internal use)"""
+    config = VIDEO_DEVICES[device_id]
+    width, height = config['capture_resolution']
+    
+    # Pick the format before the size so the driver negotiates an MJPG mode
+    cap.set(cv2.CAP_PROP_FOURCC, CAPTURE_FOURCC)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
+    mjpg = int(cap.get(cv2.CAP_PROP_FOURCC)) == CAPTURE_FOURCC
+    if not mjpg:
+        print(f"[!] {config['node']} refused MJPG, capturing uncompressed")
+    
+    # Without a software flip the camera's own JPEG can be saved as-is
+    passthrough = mjpg and not _software_rotate(config)
+    cap.set(cv2.CAP_PROP_CONVERT_RGB, 0 if passthrough else 1)
+    
+    # Let exposure adjust on real frames; grab() skips decoding the ones we discard
+    for _ in range(skip_frames):
+        cap.grab()
+    
+    if not cap.grab():
+        return False, None
+    ret, frame = cap.retrieve(None if passthrough else _acquire_frame(width, height))
+    if ret and frame is not None:
+        # Only a frame that actually arrived shows the sensor has settled
+        _last_capture_ts[device_id] = time.monotonic()
+    return ret, frame
+
+def _software_rotate(config: Dict) -> bool:
+    """Check whether frames from a camera still need a 180 degree flip in software (internal use)"""
+    return config['rotate'] and not config['sensor_flip']
+
+def _as_raw_jpeg(data: np.ndarray) -> Optional[np.ndarray]:
+    """Return an undecoded MJPG frame as a flat JPEG byte array if it can be saved as-is (internal use)"""
+    if data.ndim != 2 or data.shape[0] != 1:
+        return None
+    jpeg = data.reshape(-1)
+    header = jpeg[:4096].tobytes()
+    # Many UVC cameras leave out the Huffman tables (DHT); such files need re-encoding to open anywhere
+    if not header.startswith(b'\xff\xd8') or b'\xff\xc4' not in header:
+        return None
+    return jpeg
+
+def _jpeg_params(quality: int) -> List[int]:
+    """imencode flags for saved stills; optimized Huffman tables shrink files without changing pixels (internal use)"""
+    return [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+
+def _write_file(filepath: str, encoded):
+    """Write an encoded image straight from its buffer and hint the kernel to drop its pages once written back (internal use)"""
+    data = memoryview(encoded).cast('B')
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+        if hasattr(os, 'posix_fadvise'):
+            # No fsync here (too slow on the SD card): DONTNEED only drops pages that are already
+            # clean, so this is a hint to free them once written back; saved stills are not read back
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def _submit_write(limit: threading.BoundedSemaphore, fn, *args):
+    """Run fn on the writer pool while holding a slot of limit; waits for a free slot (internal use)"""
+    limit.acquire()
+    try:
+        future = _image_writer.submit(fn, *args)
+    except Exception:
+        # Nothing was queued, so nothing will release the slot later
+        limit.release()
+        raise
+    future.add_done_callback(lambda _: limit.release())
+    return future
+
+def _write_image_async(filepath: str, encoded):
+    """Write an encoded image to disk on the writer pool (internal use)"""
+    def report(future):
+        if future.exception():
+            print(f"[!] Failed to write {filepath}: {future.exception()}")
         else:
-            print(f"[!] Failed to restart preview for {device_id}")
+            size_mb = encoded.nbytes / (1024*1024)
+            print(f"[+] Photo saved: {os.path.abspath(filepath)} ({size_mb:.1f} MB)")
+    
+    _submit_write(_pending_writes, _write_file, filepath, encoded).add_done_callback(report)
+
+def _remove_quietly(path: str):
+    """Delete a temporary file if it exists (internal use)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _move_image_async(src: str, dst: str):
+    """Move a finished image from tmpfs to its destination on the writer pool (internal use)"""
+    def move() -> int:
+        size = os.path.getsize(src)
+        try:
+            shutil.move(src, dst)
+        except Exception:
+            # Don't leave the image in RAM for good
+            _remove_quietly(src)
+            raise
+        return size
+    
+    def report(future):
+        if future.exception():
+            print(f"[!] Failed to move {src} to {dst}: {future.exception()}")
+        else:
+            size_mb = future.result() / (1024*1024)
+            print(f"[+] Photo saved: {os.path.abspath(dst)} ({size_mb:.1f} MB)")
+    
+    try:
+        future = _submit_write(_pending_writes, move)
+    except Exception:
+        _remove_quietly(src)
+        raise
+    future.add_done_callback(report)
 
-def start_preview_stream(device_id: str) -> bool:
-    """Start preview stream for a camera (public function)"""
+def _acquire_frame(width: int, height: int) -> np.ndarray:
+    """Take a full-resolution capture buffer from the pool, allocating if empty (internal use)"""
+    pool = _frame_pool.setdefault((width, height), queue.Queue(maxsize=CAPTURE_POOL_SIZE))
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return np.empty((height, width, 3), dtype=np.uint8)
+
+def _release_frame(frame: np.ndarray):
+    """Return a capture buffer to the pool for the next capture (internal use)"""
+    height, width = frame.shape[:2]
+    pool = _frame_pool.setdefault((width, height), queue.Queue(maxsize=CAPTURE_POOL_SIZE))
+    try:
+        pool.put_nowait(frame)
+    except queue.Full:
+        pass
+
+def _release_frame_pool():
+    """Free pooled capture buffers once no timelapse needs them (internal use)"""
+    if any(worker.is_running() for worker in list(_timelapse_workers.values())):
+        return
+    # Wait for the in-flight save so its buffer is not returned to the pool after clearing
+    with _pending_frames:
+        _frame_pool.clear()
+
+def _save_image_async(filepath: str, frame, quality: int = CAPTURE_JPEG_QUALITY):
+    """JPEG-encode a pooled frame, write it and recycle the frame on the writer pool (internal use)"""
+    def save() -> int:
+        try:
+            # imencode releases the GIL, so encodes for several cameras run on separate cores
+            success, encoded = cv2.imencode('.jpg', frame, _jpeg_params(quality))
+        finally:
+            _release_frame(frame)
+        if not success:
+            raise RuntimeError("Failed to encode image")
+        _write_file(filepath, encoded)
+        return encoded.nbytes
+    
+    def report(future):
+        if future.exception():
+            print(f"[!] Failed to save {filepath}: {future.exception()}")
+        else:
+            size_mb = future.result() / (1024*1024)
+            print(f"[+] Photo saved: {os.path.abspath(filepath)} ({size_mb:.1f} MB)")
+    
+    # Decoded full-resolution frames are huge; wait for the previous one to be encoded
+    _submit_write(_pending_frames, save).add_done_callback(report)
+
+def _pause_preview_stream(device_id: str) -> Optional[VideoStream]:
+    """Pause preview stream for device so it releases the camera (internal use)"""
+    stream = _camera_streams.get(device_id)
+    if stream:
+        stream.pause()
+    return stream
+
+def _resume_preview_stream(stream: Optional[VideoStream]):
+    """Resume a preview stream paused by _pause_preview_stream (internal use)"""
+    if stream is None or not stream.is_running():
+        # Stopped during the capture, e.g. by stop_preview_stream() or cleanup_all()
+        return
+    if stream.resume():
+        print(f"[+] Preview resumed for {stream.device_id}")
+    else:
+        print(f"[!] Failed to resume preview for {stream.device_id}")
+
+def start_preview_stream(device_id: str, on_frame: Optional[Callable[[str], None]] = None) -> bool:
+    """
+    Start preview stream for a camera (public function)
+    
+    Args:
+        device_id: Camera device ID
+        on_frame: Called from the reader thread with the device ID whenever a new frame
+            is ready, e.g. to post a Tk virtual event instead of polling get_preview_frame()
+            
+    Returns:
+        bool: True if the preview is running
+    """
     if device_id not in VIDEO_DEVICES:
         return False
     
@@ -565,7 +1071,7 @@ def start_preview_stream(device_id: str) -> bool:
         return True
     
     config = VIDEO_DEVICES[device_id]
-    stream = VideoStream(config)
+    stream = VideoStream(config, on_frame)
     return stream.start()
 
 def stop_preview_stream(device_id: str) -> bool:
@@ -575,15 +1081,64 @@ def stop_preview_stream(device_id: str) -> bool:
         return True
     return False
 
-def get_preview_frame(device_id: str):
-    """Get current preview frame for a camera"""
+def set_preview_visible(device_id: str, visible: bool) -> bool:
+    """
+    Tell a preview stream whether its frames are on screen
+    
+    Args:
+        device_id: Camera device ID
+        visible: False while the preview widget is hidden (e.g. on a Tk <Unmap> event)
+        
+    Returns:
+        bool: True if a preview stream is running for the camera
+    """
+    if device_id in _camera_streams:
+        _camera_streams[device_id].set_visible(visible)
+        return True
+    return False
+
+def get_preview_frame(device_id: str, timeout: Optional[float] = None):
+    """
+    Get the newest preview frame for a camera
+    
+    Args:
+        device_id: Camera device ID
+        timeout: Seconds to wait for a new frame; None returns immediately
+        
+    Returns:
+        The new frame, or None if no new frame arrived since the last call.
+        Hand it to release_preview_frame() once it is no longer needed.
+    """
     if device_id in _camera_streams:
-        return _camera_streams[device_id].frame
+        try:
+            if timeout is None:
+                return _camera_streams[device_id].q.get_nowait()
+            return _camera_streams[device_id].q.get(timeout=timeout)
+        except queue.Empty:
+            return None
     return None
 
+def release_preview_frame(device_id: str, frame) -> bool:
+    """
+    Return a frame from get_preview_frame() so the stream can decode into it again
+    
+    Args:
+        device_id: Camera device ID
+        frame: Frame previously returned by get_preview_frame(); do not use it afterwards
+        
+    Returns:
+        bool: True if a preview stream is running for the camera
+    """
+    if device_id in _camera_streams:
+        _camera_streams[device_id].release(frame)
+        return True
+    return False
+
 # Cleanup function
 def cleanup_all():
     """Stop all streams and workers"""
+    global _camera_pool, _image_writer
+    
     # Stop all timelapse workers
     for device_id in list(_timelapse_workers.keys()):
         stop_timelapse(device_id)
@@ -592,4 +1147,13 @@ def cleanup_all():
     for device_id in list(_camera_streams.keys()):
         stop_preview_stream(device_id)
     
+    # Flush pending captures and image writes, then replace the pools so the module stays usable
+    _camera_pool.shutdown(wait=True)
+    _image_writer.shutdown(wait=True)
+    _camera_pool = ThreadPoolExecutor(max_workers=len(VIDEO_DEVICES), thread_name_prefix='cam-capture')
+    _image_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cam-writer')
+    _frame_pool.clear()
+    
+    v4l2_controls.close_all()
+    
     print("[+] Camera system cleanup completed")
\ No newline at end of file
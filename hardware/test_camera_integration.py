@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for camera timelapse scheduling
+This script tests the timelapse logic without requiring actual cameras
+"""
+
+import math
+import os
+import sys
+from unittest.mock import Mock, patch
+
+# Allow running from the hardware directory as well as the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hardware import camera_integration
+
+class FakeClock:
+    """Monotonic clock that only moves when the worker waits"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def wait(self, timeout):
+        self.now += timeout
+        return False
+
+def run_schedule(interval, duration):
+    """Run a timelapse worker on a fake clock and return the captured filenames"""
+    clock = FakeClock()
+    capture = Mock(side_effect=lambda device_id, save_path, filename: (True, filename))
+
+    worker = camera_integration.TimelapseWorker('video0', interval, duration, 'unused', 'test')
+    worker._stop_event = Mock(wait=clock.wait)
+    worker.running = True
+
+    with patch.object(camera_integration, 'time', clock), \
+         patch.object(camera_integration, 'capture_image', capture):
+        worker._worker()
+
+    return [call.args[2] for call in capture.call_args_list]
+
+def test_timelapse_schedule():
+    """Test that every interval slot is captured once, numbered without gaps"""
+    print("Testing timelapse schedule...")
+
+    for interval, duration in [(30, 120), (25, 100), (30, 100), (7, 60)]:
+        filenames = run_schedule(interval, duration)
+        expected_count = math.ceil(duration / interval)
+        expected = [f"test_frame_{i:04d}.jpg" for i in range(expected_count)]
+
+        assert filenames == expected, \
+            f"interval={interval}, duration={duration}: got {filenames}, expected {expected}"
+
+    print("✓ Timelapse captures ceil(duration / interval) frames, one per slot")
+
+def test_timelapse_rejects_bad_timing():
+    """Test that zero, negative and non-finite timing never starts a worker"""
+    print("Testing timelapse timing validation...")
+
+    bad_timings = [
+        (0, 60), (30, 0), (-5, 60), (30, -60),
+        (float('nan'), 60), (30, float('nan')),
+        (float('inf'), 60), (30, float('inf')),
+        ('abc', 60), (None, 60),
+    ]
+
+    with patch.object(camera_integration, 'TimelapseWorker') as worker_cls, \
+         patch.object(camera_integration.os, 'makedirs') as makedirs:
+        for interval, duration in bad_timings:
+            result = camera_integration.start_timelapse('video0', interval, duration, 'unused')
+            assert result is False, f"interval={interval!r}, duration={duration!r} should be rejected"
+
+        assert not worker_cls.called, "No worker should be created for invalid timing"
+        assert not makedirs.called, "No timelapse folder should be created for invalid timing"
+
+    print("✓ Invalid timelapse timing is rejected")
+
+def main():
+    """Run all tests"""
+    print("Camera Timelapse Tests")
+    print("======================")
+
+    try:
+        test_timelapse_schedule()
+        test_timelapse_rejects_bad_timing()
+
+        print("\n✓ All tests passed!")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+V4L2 Control Module
+Sets camera controls with a direct VIDIOC_S_CTRL ioctl instead of spawning v4l2-ctl
+Linux only; callers should fall back to v4l2-ctl when a call returns False
+"""
+
+import fcntl
+import os
+import struct
+import threading
+from typing import Dict
+
+# ioctl request codes (linux/videodev2.h)
+VIDIOC_G_CTRL = 0xC008561B
+VIDIOC_S_CTRL = 0xC008561C
+
+# Control IDs by v4l2-ctl name (see docs/cam1.txt)
+V4L2_CONTROLS = {
+    'brightness': 0x00980900,
+    'contrast': 0x00980901,
+    'saturation': 0x00980902,
+    'hue': 0x00980903,
+    'white_balance_automatic': 0x0098090c,
+    'gamma': 0x00980910,
+    'horizontal_flip': 0x00980914,
+    'vertical_flip': 0x00980915,
+    'power_line_frequency': 0x00980918,
+    'white_balance_temperature': 0x0098091a,
+    'sharpness': 0x0098091b,
+    'auto_exposure': 0x009a0901,
+    'exposure_time_absolute': 0x009a0902,
+    'focus_absolute': 0x009a090a,
+    'focus_automatic_continuous': 0x009a090c,
+    'zoom_absolute': 0x009a090d,
+}
+
+# struct v4l2_control { __u32 id; __s32 value; }
+_V4L2_CONTROL = struct.Struct('Ii')
+
+# Control fds are opened once per device node and reused
+_device_fds: Dict[str, int] = {}
+_fd_lock = threading.Lock()
+
+def _get_fd(device_node: str) -> int:
+    """Return the cached control fd for a device, opening it on first use"""
+    with _fd_lock:
+        fd = _device_fds.get(device_node)
+        if fd is None:
+            fd = os.open(device_node, os.O_RDWR | os.O_NONBLOCK)
+            _device_fds[device_node] = fd
+        return fd
+
+def _drop_fd(device_node: str):
+    """Close a cached fd so the next call reopens the device"""
+    with _fd_lock:
+        fd = _device_fds.pop(device_node, None)
+    if fd is not None:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+def set_control(device_node: str, control: str, value: int) -> bool:
+    """
+    Set a single camera control
+
+    Args:
+        device_node: Camera device path (e.g., '/dev/video0')
+        control: v4l2-ctl control name (e.g., 'focus_absolute')
+        value: New control value
+
+    Returns:
+        bool: True if the driver accepted the value
+    """
+    control_id = V4L2_CONTROLS.get(control)
+    if control_id is None:
+        return False
+
+    try:
+        fd = _get_fd(device_node)
+        fcntl.ioctl(fd, VIDIOC_S_CTRL, _V4L2_CONTROL.pack(control_id, int(value)))
+        return True
+    except OSError:
+        # Device may have been unplugged; reopen on the next call
+        _drop_fd(device_node)
+        return False
+
+def get_control(device_node: str, control: str):
+    """
+    Read a single camera control
+
+    Args:
+        device_node: Camera device path
+        control: v4l2-ctl control name
+
+    Returns:
+        int or None: Current value, or None if it could not be read
+    """
+    control_id = V4L2_CONTROLS.get(control)
+    if control_id is None:
+        return None
+
+    try:
+        fd = _get_fd(device_node)
+        buf = bytearray(_V4L2_CONTROL.pack(control_id, 0))
+        fcntl.ioctl(fd, VIDIOC_G_CTRL, buf)
+        return _V4L2_CONTROL.unpack(buf)[1]
+    except OSError:
+        _drop_fd(device_node)
+        return None
+
+def close_all():
+    """Close all cached control fds"""
+    for device_node in list(_device_fds.keys()):
+        _drop_fd(device_node)
@@ -1,3 +1,4 @@
+import math
 import os
 from datetime import datetime
 import time
@@ -159,7 +160,7 @@ def capture_live_print(comand, klipper_ctrl, prnt , file_path):
             print(f"✓ Timelapse started successfully")
             print(f"   Duration: {time_lapse_duration}s")
             print(f"   Interval: {time_lapse_interval}s")
-            print(f"   Expected frames: {time_lapse_duration // time_lapse_interval}")
+            print(f"   Expected frames: {math.ceil(time_lapse_duration / time_lapse_interval)}")
             return f"timelapse_started_{camera_id}_{timelapse_prefix}"
         else:
             print(f"✗ Failed to start timelapse")
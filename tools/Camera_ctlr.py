@@ -1,14 +1,53 @@
 #!/usr/bin/env python3
+import os
 import subprocess
+import sys
 import tkinter as tk
 from tkinter import ttk
 
+# Add the parent directory to sys.path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hardware import v4l2_controls
+
 # Camera node
 DEVICE_NODE = '/dev/video0'
 
+# Slider drags fire once per pixel; only apply the value once it settles
+SLIDER_DEBOUNCE_MS = 50
+# The focus motor lags the slider, so wait a little longer before moving it
+SLIDER_DEBOUNCE_OVERRIDES_MS = {"focus_absolute": 80}
+
+# Last value written to each control
+_applied = {}
+
 # Function to set camera control
 def set_control(control, value):
-    subprocess.run(["v4l2-ctl", "-d", DEVICE_NODE, f"--set-ctrl={control}={value}"])
+    value = int(float(value))
+    if _applied.get(control) == value:
+        return
+    if not v4l2_controls.set_control(DEVICE_NODE, control, value):
+        subprocess.run(["v4l2-ctl", "-d", DEVICE_NODE, f"--set-ctrl={control}={value}"])
+    _applied[control] = value
+
+# Pending slider updates, keyed by control name
+_pending = {}
+
+def set_control_debounced(control, value):
+    if control in _pending:
+        root.after_cancel(_pending[control])
+    delay = SLIDER_DEBOUNCE_OVERRIDES_MS.get(control, SLIDER_DEBOUNCE_MS)
+    _pending[control] = root.after(delay, apply_pending, control, value)
+
+def apply_pending(control, value):
+    _pending.pop(control, None)
+    set_control(control, value)
+
+def apply_now(control, value):
+    # Releasing the slider commits its value without waiting out the debounce
+    if control in _pending:
+        root.after_cancel(_pending.pop(control))
+    set_control(control, value)
 
 # Create GUI
 root = tk.Tk()
@@ -37,42 +76,42 @@ menu_controls = [
     ("Auto Exposure Mode", "auto_exposure", {1: "Manual Mode", 3: "Aperture Priority"}, 3),
 ]
 
+# All controls share one grid on root, so the layout is solved once instead of per row frame
+row = 0
+
 # Slider Controls
 for label, control, min_val, max_val, default in controls:
-    frame = tk.Frame(root)
-    frame.pack(fill="x", padx=10, pady=5)
-
-    tk.Label(frame, text=label, width=20).pack(side="left")
-    slider = tk.Scale(frame, from_=min_val, to=max_val, orient="horizontal", length=300,
-                      command=lambda val, c=control: set_control(c, val))
+    ttk.Label(root, text=label, width=20).grid(row=row, column=0, sticky="w", padx=10, pady=5)
+    # tk.Scale rather than ttk.Scale: it snaps to integers and shows the current value
+    slider = tk.Scale(root, from_=min_val, to=max_val, orient="horizontal", length=300,
+                      command=lambda val, c=control: set_control_debounced(c, val))
     slider.set(default)
-    slider.pack(side="right")
+    slider.bind("<ButtonRelease-1>", lambda event, c=control: apply_now(c, event.widget.get()))
+    slider.grid(row=row, column=1, sticky="e", padx=10, pady=5)
+    row += 1
 
 # Boolean Controls
 for label, control, default in bool_controls:
-    frame = tk.Frame(root)
-    frame.pack(fill="x", padx=10, pady=5)
-
     var = tk.IntVar(value=default)
-    chk = tk.Checkbutton(frame, text=label, variable=var,
-                         command=lambda c=control, v=var: set_control(c, v.get()))
-    chk.pack(anchor="w")
+    chk = ttk.Checkbutton(root, text=label, variable=var,
+                          command=lambda c=control, v=var: set_control(c, v.get()))
+    chk.grid(row=row, column=0, columnspan=2, sticky="w", padx=10, pady=5)
+    row += 1
 
 # Menu Controls
 for label, control, options, default in menu_controls:
-    frame = tk.Frame(root)
-    frame.pack(fill="x", padx=10, pady=5)
-
-    tk.Label(frame, text=label, width=20).pack(side="left")
-    combo = ttk.Combobox(frame, values=list(options.values()), state="readonly")
+    ttk.Label(root, text=label, width=20).grid(row=row, column=0, sticky="w", padx=10, pady=5)
+    combo = ttk.Combobox(root, values=list(options.values()), state="readonly")
     combo.current(list(options.keys()).index(default))
-    combo.pack(side="right")
+    combo.grid(row=row, column=1, sticky="e", padx=10, pady=5)
 
     def menu_callback(event, c=control, o=options):
-        selection = combo.get()
+        selection = event.widget.get()
         value = [k for k, v in o.items() if v == selection][0]
         set_control(c, value)
 
     combo.bind("<<ComboboxSelected>>", menu_callback)
+    row += 1
 
 root.mainloop()
+v4l2_controls.close_all()
@@ -10,7 +10,9 @@ from datetime import datetime
 # Camera 2 & 3: Continuous video recording
 # Preview functionality for all cameras
 
-
+PREVIEW_TILE_SIZE = (640, 480)
+PREVIEW_INTERPOLATION = cv2.INTER_NEAREST  # Display only; fastest downscale of the 1080p frames
+PREVIEW_IDLE_WAIT = 0.1  # Back-off when no camera delivered a frame
 
 
 
@@ -164,6 +166,8 @@ class CameraSystem:
     
     def _preview_loop(self):
         """Internal method for preview display"""
+        tile_w, tile_h = PREVIEW_TILE_SIZE
+        combined = None
         try:
             while self.preview_active:
                 frames = {}
@@ -175,34 +179,33 @@ class CameraSystem:
                         frames[camera_id] = frame
                 
                 if frames:
-                    # Create combined preview
-                    preview_frames = []
-                    for camera_id in sorted(frames.keys()):
-                        frame = frames[camera_id]
-                        # Resize for preview
-                        frame = cv2.resize(frame, (640, 480))
-                        cv2.putText(frame, f"Camera {camera_id}", (10, 30), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                        preview_frames.append(frame)
+                    # Lay cameras out side by side, or in a 2x2 grid for 3+ cameras
+                    camera_ids = sorted(frames.keys())[:4]
+                    rows = 1 if len(camera_ids) <= 2 else 2
+                    cols = 1 if len(camera_ids) == 1 else 2
+                    shape = (rows * tile_h, cols * tile_w, 3)
+                    
+                    # Reuse one display buffer; only reallocate when the layout changes
+                    if combined is None or combined.shape != shape:
+                        combined = np.zeros(shape, dtype=np.uint8)
                     
-                    # Combine frames horizontally
-                    if len(preview_frames) == 1:
-                        combined = preview_frames[0]
-                    elif len(preview_frames) == 2:
-                        combined = np.hstack(preview_frames)
-                    else:
-                        # Stack 3 cameras in a 2x2 grid (with one empty)
-                        top_row = np.hstack(preview_frames[:2])
-                        bottom_row = np.hstack([preview_frames[2], np.zeros_like(preview_frames[0])])
-                        combined = np.vstack([top_row, bottom_row])
+                    for i, camera_id in enumerate(camera_ids):
+                        row, col = divmod(i, 2)
+                        tile = combined[row*tile_h:(row+1)*tile_h, col*tile_w:(col+1)*tile_w]
+                        # Resize straight into the tile instead of allocating per frame
+                        cv2.resize(frames[camera_id], (tile_w, tile_h), dst=tile,
+                                   interpolation=PREVIEW_INTERPOLATION)
+                        cv2.putText(tile, f"Camera {camera_id}", (10, 30), 
+                                  cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
                     
                     cv2.imshow("Camera Preview", combined)
                     
                     # Check for key press to close
                     if cv2.waitKey(1) & 0xFF == ord('q'):
                         break
-                
-                time.sleep(0.033)  # ~30 FPS
+                else:
+                    # read() already paces the loop to the cameras; only back off when they are silent
+                    time.sleep(PREVIEW_IDLE_WAIT)
                 
         except Exception as e:
             print(f"Error in preview loop: {e}")